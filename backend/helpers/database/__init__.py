@@ -0,0 +1,27 @@
+# Shared database clients; each one is created once per process, on first use.
+# Exports resolve lazily so importing a leaf module such as
+# helpers.database.models does not load the drivers or build the engine.
+import importlib
+
+_EXPORTS = {
+    "get_mongo": "connect_to_mongodb",
+    "get_weaviate": "connect_to_weaviatedb",
+    "get_pg_engine": "get_pg_engine",
+    "SessionLocal": "SessionLocal",
+    "ScopedSession": "ScopedSession",
+    "check_db_connection": "check_db_connection",
+    "get_conn": "get_conn",
+    "get_db": "get_db",
+    "get_db_context": "get_db_context",
+    "stream_results": "stream_results",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Resolve exported clients from connection_to_db on first access"""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module("helpers.database.connection_to_db")
+    return getattr(module, _EXPORTS[name])
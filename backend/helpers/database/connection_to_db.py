@@ -1,89 +1,386 @@
-import os
-from dotenv import load_dotenv
+import asyncio
+import atexit
+import time
+import functools
+from contextlib import asynccontextmanager
 from fastapi import HTTPException
 from pymongo import MongoClient
-from logger import get_logger
+from helpers.logger import get_logger
+from helpers.settings import get_settings
 from typing import List, Dict, Any
 import traceback
 import hashlib
 import requests
 import weaviate
 from weaviate.util import generate_uuid5
-from weaviate.classes.init import Auth
+from weaviate.classes.init import Auth, AdditionalConfig, Timeout
 from datetime import datetime, timedelta, timezone
 import redis
 import uuid
 from pymongo import ReturnDocument
 import ast
+import orjson
+from sqlalchemy import text
+from sqlalchemy.engine import URL
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import (
+    create_async_engine,
+    AsyncSession,
+    async_sessionmaker,
+    async_scoped_session,
+)
 
 logger = get_logger()
-load_dotenv()
-# mongo
-mongo_user = os.getenv("MONGODB_USERNAME")
-mongo_password = os.getenv("MONGODB_PASSWORD")
-mongo_host = os.getenv("MONGODB_HOST")
-mongo_port = os.getenv("MONGODB_PORT")
-mongo_auth_mechanism = os.getenv("MONGODB_AUTHMECHANISM")
-
-weaviate_api_key = os.getenv("WEAVIATE_API_KEY")
-weaviate_host = os.getenv("WEAVIATE_HOST")
-weaviate_port = os.getenv("WEAVIATE_PORT")
-weaviate_is_secure = os.getenv("WEAVIATE_SECURE")
-weaviate_grpc_host = os.getenv("WEAVIATE_GRPC_HOST")
-weaviate_grpc_port = os.getenv("WEAVIATE_GRPC_PORT")
+settings = get_settings()
+
 DATASET_TYPE = "PRODUCT CATALOG"
-# Construct the MongoDB connection string
-MONGO_CONNECTION_STRING = f"mongodb://{mongo_user}:{mongo_password}@{mongo_host}:{mongo_port}/?authMechanism={mongo_auth_mechanism}"
+_SELECT_ONE = text("SELECT 1")
+DB_HEALTH_CACHE_SECONDS = 1.0
+_last_db_check_ok = float("-inf")
+STREAM_YIELD_PER = 1000
+WEAVIATE_READY_ATTEMPTS = 3
+# Compiled-statement LRU per engine; SQLAlchemy's default of 500 thrashes with many query shapes
+DB_QUERY_CACHE_SIZE = 1200
+
+
+@functools.lru_cache(maxsize=1)
+def _get_weaviate_client():
+    """
+    Creates the process-wide Weaviate client. Failures raise and are not cached.
+
+    Returns:
+        WeaviateClient: The connected Weaviate client instance.
+    """
+    if not all(
+        [
+            settings.weaviate_host,
+            settings.weaviate_port,
+            settings.weaviate_grpc_host,
+            settings.weaviate_grpc_port,
+        ]
+    ):
+        raise ValueError("Missing required Weaviate connection parameters.")
+
+    # Use secure or insecure connection based on configuration
+    auth = (
+        Auth.api_key(settings.weaviate_api_key)
+        if settings.weaviate_api_key
+        else None
+    )
+
+    # Retry both the initial connect (raises while the server is unreachable)
+    # and readiness; once connected, keep polling on the already-open channel
+    client = None
+    for attempt in range(WEAVIATE_READY_ATTEMPTS):
+        try:
+            if client is None:
+                client = weaviate.connect_to_custom(
+                    http_host=settings.weaviate_host,
+                    http_port=settings.weaviate_port,
+                    http_secure=settings.weaviate_secure,
+                    grpc_host=settings.weaviate_grpc_host,
+                    grpc_port=settings.weaviate_grpc_port,
+                    grpc_secure=settings.weaviate_secure,
+                    auth_credentials=auth,
+                    additional_config=AdditionalConfig(
+                        timeout=Timeout(init=3, query=10, insert=30)
+                    ),
+                )
+            if client.is_ready():
+                atexit.register(client.close)
+                return client
+            reason = "not ready"
+        except Exception as e:
+            reason = str(e)
+        if attempt < WEAVIATE_READY_ATTEMPTS - 1:
+            delay = 0.2 * 2**attempt
+            logger.warning(f"Weaviate unavailable ({reason}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    if client is not None:
+        client.close()
+    raise RuntimeError(f"Weaviate is not available: {reason}")
+
+
+@functools.lru_cache(maxsize=1)
+def _get_mongo_client():
+    """
+    Creates the process-wide MongoDB client with a pre-warmed connection pool.
+
+    Returns:
+        MongoClient: The MongoDB client instance.
+    """
+    # Keyword args instead of a URI: no URI parsing, no password in a module global
+    credentials = (
+        {
+            "username": settings.mongodb_username,
+            "password": settings.mongodb_password,
+            "authMechanism": settings.mongodb_authmechanism or "DEFAULT",
+        }
+        if settings.mongodb_username
+        else {}
+    )
+    client = MongoClient(
+        host=settings.mongodb_host,
+        port=settings.mongodb_port,
+        appname="pulseboard",
+        **credentials,
+        maxPoolSize=50,
+        minPoolSize=5,
+        serverSelectionTimeoutMS=3000,
+        connectTimeoutMS=3000,
+        socketTimeoutMS=10000,
+        compressors="zstd,snappy",
+    )
+    try:
+        # MongoClient connects lazily; ping so a dead server fails here, not per query
+        client.admin.command("ping")
+    except Exception:
+        client.close()
+        raise
+    atexit.register(client.close)
+    return client
 
 
 def connect_to_weaviatedb():
     """
     Connects to the Weaviate DB instance using the provided connection string.
+    The client is created once per process and reused on subsequent calls.
 
     Returns:
-        WeaviateClient: The MongoDB client instance.
+        WeaviateClient: The Weaviate client instance.
+
+    Raises:
+        HTTPException: 503 if Weaviate is unreachable or not ready.
     """
     try:
-        if not all(
-            [weaviate_host, weaviate_port, weaviate_grpc_host, weaviate_grpc_port]
-        ):
-            raise ValueError("Missing required Weaviate connection parameters.")
-
-        # Use secure or insecure connection based on configuration
-        auth = Auth.api_key(weaviate_api_key) if weaviate_api_key else None
-
-        client = weaviate.connect_to_custom(
-            http_host=weaviate_host,
-            http_port=weaviate_port,
-            http_secure=weaviate_is_secure,
-            grpc_host=weaviate_grpc_host,
-            grpc_port=weaviate_grpc_port,
-            grpc_secure=weaviate_is_secure,
-            auth_credentials=auth,
-        )
-
-        if client.is_ready():
-            logger.debug("Connected successfully to WeaviateDB!")
-            return client
-        else:
-            logger.error("Weaviate client is not ready.")
-            return None
+        client = _get_weaviate_client()
+        logger.debug("Connected successfully to WeaviateDB!")
+        return client
     except Exception as e:
         logger.error(f"Failed to connect to WeaviateDB: {e}")
-        return None
+        raise HTTPException(status_code=503, detail="weaviate unavailable")
 
 
 def connect_to_mongodb():
     """
-    Connects to the MongoDB instance using the provided connection string.
+    Connects to the MongoDB instance using the configured host and credentials.
+    The client is created once per process and reused on subsequent calls.
 
     Returns:
         MongoClient: The MongoDB client instance.
+
+    Raises:
+        HTTPException: 503 if MongoDB cannot be reached within the timeouts.
     """
     try:
-        client = MongoClient(MONGO_CONNECTION_STRING)
+        client = _get_mongo_client()
         logger.debug("Connected successfully to MongoDB!")
         return client
     except Exception as e:
         logger.error(f"Failed to connect to MongoDB: {e}")
-        return None
\ No newline at end of file
+        raise HTTPException(status_code=503, detail="mongo unavailable")
+
+
+def _json_serializer(value):
+    """Serialize JSON/JSONB column values with orjson (SQLAlchemy expects str)"""
+    return orjson.dumps(
+        value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    ).decode()
+
+
+def connect_to_postgresql():
+    """
+    Creates the async SQLAlchemy engine for the PostgreSQL instance.
+
+    Returns:
+        AsyncEngine: The SQLAlchemy engine backed by the asyncpg driver.
+    """
+    url = URL.create(
+        drivername="postgresql+asyncpg",
+        username=settings.db_user,
+        password=settings.db_password,
+        host=settings.db_host,
+        port=settings.db_port,
+        database=settings.db_name,
+    )
+    connect_args = {
+        # Keep parsed/planned statements per connection instead of re-preparing
+        "statement_cache_size": 1024,
+        "prepared_statement_cache_size": 1024,
+        # JIT compilation costs more than it saves on short OLTP queries
+        "server_settings": {"jit": "off", "application_name": "pulseboard"},
+    }
+
+    engine_kwargs = {
+        "connect_args": connect_args,
+        "query_cache_size": DB_QUERY_CACHE_SIZE,
+        "json_serializer": _json_serializer,
+        "json_deserializer": orjson.loads,
+    }
+
+    if settings.db_pool_mode == "pgbouncer":
+        # PgBouncer already pools connections, and in transaction mode a
+        # statement prepared on one server connection is missing on the next
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        # Unique names so a server connection shared between clients never
+        # sees two __asyncpg_stmt_N__ statements with the same name
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+        # Connections are never reused, so pre-ping and recycle do not apply
+        engine_kwargs["poolclass"] = NullPool
+        pool_description = "NullPool, behind PgBouncer"
+    else:
+        engine_kwargs.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            pool_recycle=settings.db_pool_recycle,
+        )
+        pool_description = (
+            f"pool_size={settings.db_pool_size}, "
+            f"max_overflow={settings.db_max_overflow}, "
+            f"pool_timeout={settings.db_pool_timeout}s"
+        )
+
+    engine = create_async_engine(url, **engine_kwargs)
+    logger.info(f"Created PostgreSQL async engine ({pool_description})")
+    return engine
+
+
+class _PgSession(Session):
+    """Sync session behind AsyncSession that resolves the engine on first use"""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.bind is None:
+            return get_pg_engine().sync_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+SessionLocal = async_sessionmaker(
+    class_=AsyncSession, sync_session_class=_PgSession, expire_on_commit=False
+)
+# Task-local session for background jobs and scripts outside FastAPI requests
+ScopedSession = async_scoped_session(SessionLocal, scopefunc=asyncio.current_task)
+
+
+@functools.lru_cache(maxsize=1)
+def get_pg_engine():
+    """
+    Gets the process-wide PostgreSQL engine, creating it on first use.
+
+    Returns:
+        AsyncEngine: The engine shared by all sessions and connections.
+    """
+    return connect_to_postgresql()
+
+
+async def get_db():
+    """
+    FastAPI dependency that yields an async database session.
+
+    Usage:
+        @app.get("/files")
+        async def list_files(db: AsyncSession = Depends(get_db)):
+            ...
+
+    Yields:
+        AsyncSession: A session closed once the request finishes.
+    """
+    async with SessionLocal() as db:
+        yield db
+
+
+async def get_conn():
+    """
+    FastAPI dependency that yields a pooled connection for read-only routes.
+    Skips Session setup (identity map, autoflush) for endpoints that only
+    execute select() statements.
+
+    Usage:
+        @app.get("/files")
+        async def list_files(conn: AsyncConnection = Depends(get_conn)):
+            rows = (await conn.execute(select(...))).all()
+
+    Yields:
+        AsyncConnection: A connection returned to the pool once the request finishes.
+    """
+    async with get_pg_engine().connect() as conn:
+        yield conn
+
+
+@asynccontextmanager
+async def get_db_context():
+    """
+    Async context manager for database sessions outside of FastAPI routes.
+    Nested calls within the same asyncio task share one scoped session,
+    which is removed when the outermost context exits.
+
+    Usage:
+        async with get_db_context() as db:
+            ...
+
+    Yields:
+        AsyncSession: A session that the outermost context rolls back on
+        error and closes on exit.
+    """
+    is_owner = not ScopedSession.registry.has()
+    db = ScopedSession()
+    try:
+        yield db
+    except Exception:
+        # Nested contexts share the owner's session; rolling back here would
+        # discard the owner's pending work if it catches the error and continues
+        if is_owner:
+            await db.rollback()
+        raise
+    finally:
+        if is_owner:
+            await ScopedSession.remove()
+
+
+async def stream_results(db, statement, yield_per=STREAM_YIELD_PER):
+    """
+    Executes a statement on a server-side cursor and streams the rows in
+    batches, so large result sets are never fully materialized in memory.
+
+    Usage:
+        async with get_db_context() as db:
+            result = await stream_results(db, select(Model))
+            async for obj in result.scalars():
+                ...
+
+    Args:
+        db: An AsyncSession or AsyncConnection
+        statement: The select() statement to execute
+        yield_per: Number of rows fetched from the cursor per batch
+
+    Returns:
+        AsyncResult: The streamed result.
+    """
+    return await db.stream(statement, execution_options={"yield_per": yield_per})
+
+
+async def check_db_connection():
+    """
+    Checks that the PostgreSQL instance is reachable.
+    A successful check is reused for DB_HEALTH_CACHE_SECONDS so frequent
+    health probes do not each check out a connection.
+
+    Returns:
+        bool: True if a trivial query succeeds, False otherwise.
+    """
+    global _last_db_check_ok
+    if time.monotonic() - _last_db_check_ok < DB_HEALTH_CACHE_SECONDS:
+        return True
+    try:
+        async with get_pg_engine().connect() as conn:
+            await conn.execute(_SELECT_ONE)
+        _last_db_check_ok = time.monotonic()
+        logger.debug("Connected successfully to PostgreSQL!")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to connect to PostgreSQL: {e}")
+        return False
@@ -1 +1,50 @@
 # Create tables on startup
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+from helpers.database.connection_to_db import get_pg_engine
+from helpers.database.models import Base
+from helpers.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Models are imported once at module scope; configure mappers now so the
+# first query does not pay for it
+configure_mappers()
+
+# Unqualified models live in whatever schema search_path resolves to, so
+# match them against current_schema() rather than a fixed 'public'
+_EXISTING_TABLES = text(
+    "SELECT t.table_schema, t.table_name "
+    "FROM unnest(CAST(:schemas AS text[]), CAST(:names AS text[])) "
+    "AS t(table_schema, table_name) "
+    "JOIN information_schema.tables i "
+    "ON i.table_schema = COALESCE(t.table_schema, current_schema()) "
+    "AND i.table_name = t.table_name"
+)
+
+
+async def init_db():
+    """
+    Create all tables registered on Base.metadata.
+    On an empty database the per-table existence checks are skipped and
+    every table is created in a single transaction.
+
+    Returns:
+        None
+    """
+    expected = {(table.schema, table.name) for table in Base.metadata.tables.values()}
+    if not expected:
+        return
+
+    schemas, names = zip(*expected)
+    async with get_pg_engine().begin() as conn:
+        result = await conn.execute(
+            _EXISTING_TABLES, {"schemas": list(schemas), "names": list(names)}
+        )
+        existing = {tuple(row) for row in result}
+        if existing == expected:
+            return
+        # Only probe table by table when the schema is partially created
+        await conn.run_sync(Base.metadata.create_all, checkfirst=bool(existing))
+    logger.info(f"Initialized database tables: {list(Base.metadata.tables)}")
@@ -1 +1,7 @@
 # SQLAlchemy ORM models (tables)
+from sqlalchemy.orm import DeclarativeBase
+
+
+class Base(DeclarativeBase):
+    """Declarative base for all ORM models; query them with 2.0-style select()"""
+    pass
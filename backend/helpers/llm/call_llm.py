@@ -3,9 +3,7 @@ import time
 import yaml
 from pathlib import Path
 from typing import Dict, Any, Union, Optional
-import sys
 
-sys.path.insert(1, "../../")
 from helpers.llm.llm_classes import LLM
 from helpers.logger import get_logger
 
@@ -1,4 +1,3 @@
-import os
 from typing import Dict, Any, Optional
 from jinja2 import Environment, FileSystemLoader, Template
 from pathlib import Path
@@ -8,12 +7,12 @@ import google.generativeai as genai
 import cohere
 import openai
 from openai import OpenAI
-import sys
 
-sys.path.insert(1, "../../")
 from helpers.logger import get_logger
+from helpers.settings import get_settings
 
 logger = get_logger(__name__)
+settings = get_settings()
 
 
 class LLM:
@@ -98,27 +97,27 @@ class LLM:
     
     def get_gemini_llm(self):
         """Get Google Gemini LLM instance"""
-        genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
+        genai.configure(api_key=settings.google_api_key)
         model = genai.GenerativeModel(self.model_name)
         logger.info(f"Initialized Gemini: {self.model_name}")
         return GeminiWrapper(model, self.temperature, self.max_tokens)
     
     def get_cohere_llm(self):
         """Get Cohere LLM instance"""
-        client = cohere.Client(api_key=os.getenv('COHERE_API_KEY'))
+        client = cohere.Client(api_key=settings.cohere_api_key)
         logger.info(f"Initialized Cohere: {self.model_name}")
         return CohereWrapper(client, self.model_name, self.temperature, self.max_tokens)
     
     def get_openai_llm(self):
         """Get OpenAI LLM instance"""
-        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        client = OpenAI(api_key=settings.openai_api_key)
         logger.info(f"Initialized OpenAI: {self.model_name}")
         return OpenAIWrapper(client, self.model_name, self.temperature, self.max_tokens)
     
     def get_togetherai_llm(self):
         """Get TogetherAI LLM instance"""
         client = OpenAI(
-            api_key=os.getenv('TOGETHER_API_KEY'),
+            api_key=settings.together_api_key,
             base_url=self.endpoint
         )
         logger.info(f"Initialized TogetherAI: {self.model_name}")
@@ -4,11 +4,9 @@ import os
 from logging.handlers import TimedRotatingFileHandler
 from colorlog import ColoredFormatter
 from datetime import datetime
-from dotenv import load_dotenv
+from helpers.settings import get_logging_settings
 
-load_dotenv()
-
-BASE_LOG_DIR = os.getenv("BASE_LOG_DIR", "logs")
+BASE_LOG_DIR = get_logging_settings().base_log_dir
 _initialized_loggers = set()
 
 
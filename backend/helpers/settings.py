@@ -0,0 +1,90 @@
+# Application settings loaded once from the environment / .env
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+ENV_FILE = Path(__file__).resolve().parent.parent / ".env"
+
+
+class LoggingSettings(BaseSettings):
+    """The only settings the logger needs, so a bad DB/LLM value cannot break logging"""
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE, env_file_encoding="utf-8", extra="ignore"
+    )
+
+    base_log_dir: str = "logs"
+
+
+class Settings(LoggingSettings):
+    """Environment-backed configuration shared by all backend modules"""
+
+    # LLM APIs
+    openai_api_key: Optional[str] = None
+    google_api_key: Optional[str] = None
+    cohere_api_key: Optional[str] = None
+    together_api_key: Optional[str] = None
+
+    # Mongo
+    mongodb_username: Optional[str] = None
+    mongodb_password: Optional[str] = None
+    mongodb_host: Optional[str] = None
+    mongodb_port: Optional[int] = None
+    mongodb_authmechanism: Optional[str] = None
+
+    # Weaviate
+    weaviate_api_key: Optional[str] = None
+    weaviate_host: Optional[str] = None
+    weaviate_port: Optional[int] = None
+    weaviate_secure: bool = False
+    weaviate_grpc_host: Optional[str] = None
+    weaviate_grpc_port: Optional[int] = None
+
+    # Postgres
+    db_host: Optional[str] = None
+    db_port: Optional[int] = None
+    db_name: Optional[str] = None
+    db_user: Optional[str] = None
+    db_password: Optional[str] = None
+    db_pool_size: int = 20
+    db_max_overflow: int = 30
+    db_pool_timeout: int = 10
+    # Pre-ping costs a round-trip per checkout; only enable it for HA failover setups.
+    # Pre-ping and recycle are ignored in pgbouncer mode, which does not reuse connections
+    db_pool_pre_ping: bool = False
+    db_pool_recycle: int = 1800
+    # "pgbouncer" hands pooling to PgBouncer (transaction mode) and uses NullPool
+    db_pool_mode: str = "queue"
+
+    @field_validator(
+        "mongodb_port", "weaviate_port", "weaviate_grpc_port", "db_port", mode="before"
+    )
+    @classmethod
+    def empty_port_is_unset(cls, value):
+        """Treat an empty value such as DB_PORT= as unset instead of invalid"""
+        return None if value == "" else value
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the process-wide settings instance
+
+    Returns:
+        Settings: Parsed settings, read from the environment and .env only once
+    """
+    return Settings()
+
+
+@lru_cache(maxsize=1)
+def get_logging_settings() -> LoggingSettings:
+    """
+    Get the settings used by the logger
+
+    Returns:
+        LoggingSettings: Parsed logging settings, read only once
+    """
+    return LoggingSettings()
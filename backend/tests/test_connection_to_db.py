@@ -0,0 +1,272 @@
+import asyncio
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Integer, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from helpers.database import connection_to_db
+from helpers.database.connection_to_db import (
+    ScopedSession,
+    SessionLocal,
+    check_db_connection,
+    get_db_context,
+    get_pg_engine,
+)
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+class _TestBase(DeclarativeBase):
+    pass
+
+
+class _Item(_TestBase):
+    __tablename__ = "test_items"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+
+def test_nested_contexts_share_one_session():
+    async def run():
+        async with get_db_context() as outer:
+            async with get_db_context() as inner:
+                assert inner is outer
+            # The nested context must not remove the owner's session
+            assert ScopedSession.registry.has()
+        assert not ScopedSession.registry.has()
+
+    asyncio.run(run())
+
+
+@pytest.fixture
+def rollback_calls(monkeypatch):
+    calls = []
+    rollback = AsyncSession.rollback
+
+    async def recording_rollback(self):
+        calls.append(self)
+        await rollback(self)
+
+    monkeypatch.setattr(AsyncSession, "rollback", recording_rollback)
+    return calls
+
+
+def test_nested_error_keeps_owner_pending_work(rollback_calls):
+    async def run():
+        async with get_db_context() as outer:
+            item = _Item(id=1)
+            outer.add(item)
+            with pytest.raises(ValueError):
+                async with get_db_context():
+                    raise ValueError("nested failure")
+            assert item in outer.new
+            assert rollback_calls == []
+
+    asyncio.run(run())
+
+
+def test_owner_error_rolls_back_once_and_removes_session(rollback_calls):
+    async def run():
+        with pytest.raises(ValueError):
+            async with get_db_context() as db:
+                with pytest.raises(ValueError):
+                    async with get_db_context():
+                        raise ValueError("nested failure")
+                raise ValueError("owner failure")
+        assert rollback_calls == [db]
+        assert not ScopedSession.registry.has()
+
+    asyncio.run(run())
+
+
+def test_importing_models_has_no_connection_side_effects():
+    code = (
+        "import sys, helpers.database.models;"
+        "assert 'helpers.database.connection_to_db' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, check=True)
+
+
+def test_engine_is_created_once_and_used_by_sessions():
+    engine = get_pg_engine()
+    assert get_pg_engine() is engine
+    assert SessionLocal().sync_session.get_bind() is engine.sync_engine
+    assert ScopedSession.session_factory is SessionLocal
+
+
+def test_session_factories_execute_without_explicit_engine():
+    async def run():
+        if not await check_db_connection():
+            pytest.skip("PostgreSQL is not reachable with the configured DB_* settings")
+        async with SessionLocal() as db:
+            assert await db.scalar(text("SELECT 1")) == 1
+        assert await ScopedSession().scalar(text("SELECT 1")) == 1
+        await ScopedSession.remove()
+        await get_pg_engine().dispose()
+
+    asyncio.run(run())
+
+
+class _FakeWeaviateClient:
+    def __init__(self, ready):
+        self.ready = ready
+        self.ready_checks = 0
+        self.closed = False
+
+    def is_ready(self):
+        self.ready_checks += 1
+        return self.ready
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def weaviate_settings(monkeypatch):
+    for name, value in {
+        "weaviate_host": "localhost",
+        "weaviate_port": 8080,
+        "weaviate_grpc_host": "localhost",
+        "weaviate_grpc_port": 50051,
+    }.items():
+        monkeypatch.setattr(connection_to_db.settings, name, value)
+    monkeypatch.setattr(connection_to_db.time, "sleep", lambda delay: None)
+    monkeypatch.setattr(connection_to_db.atexit, "register", lambda func: None)
+    connection_to_db._get_weaviate_client.cache_clear()
+    yield
+    connection_to_db._get_weaviate_client.cache_clear()
+
+
+def test_weaviate_connect_is_retried_until_reachable(weaviate_settings, monkeypatch):
+    client = _FakeWeaviateClient(ready=True)
+    outcomes = [ConnectionError("unreachable"), client]
+
+    def connect_to_custom(**kwargs):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(connection_to_db.weaviate, "connect_to_custom", connect_to_custom)
+    assert connection_to_db._get_weaviate_client() is client
+    assert client.ready_checks == 1
+    assert not client.closed
+
+
+def test_weaviate_gives_up_after_all_attempts(weaviate_settings, monkeypatch):
+    calls = []
+
+    def connect_to_custom(**kwargs):
+        calls.append(kwargs)
+        raise ConnectionError("unreachable")
+
+    monkeypatch.setattr(connection_to_db.weaviate, "connect_to_custom", connect_to_custom)
+    with pytest.raises(RuntimeError, match="unreachable"):
+        connection_to_db._get_weaviate_client()
+    assert len(calls) == connection_to_db.WEAVIATE_READY_ATTEMPTS
+
+
+def test_weaviate_never_ready_polls_one_client_then_closes_it(
+    weaviate_settings, monkeypatch
+):
+    clients = []
+
+    def connect_to_custom(**kwargs):
+        clients.append(_FakeWeaviateClient(ready=False))
+        return clients[-1]
+
+    monkeypatch.setattr(connection_to_db.weaviate, "connect_to_custom", connect_to_custom)
+    with pytest.raises(RuntimeError, match="not ready"):
+        connection_to_db._get_weaviate_client()
+    assert len(clients) == 1
+    assert clients[0].ready_checks == connection_to_db.WEAVIATE_READY_ATTEMPTS
+    assert clients[0].closed
+
+
+@pytest.fixture
+def engine_kwargs(monkeypatch):
+    captured = {}
+    create_async_engine = connection_to_db.create_async_engine
+
+    def recording_create_async_engine(url, **kwargs):
+        captured.update(kwargs)
+        return create_async_engine(url, **kwargs)
+
+    monkeypatch.setattr(
+        connection_to_db, "create_async_engine", recording_create_async_engine
+    )
+    return captured
+
+
+def test_pgbouncer_mode_uses_null_pool_without_statement_caches(
+    engine_kwargs, monkeypatch
+):
+    monkeypatch.setattr(connection_to_db.settings, "db_pool_mode", "pgbouncer")
+    engine = connection_to_db.connect_to_postgresql()
+
+    assert isinstance(engine.pool, NullPool)
+    connect_args = engine_kwargs["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    names = {connect_args["prepared_statement_name_func"]() for _ in range(2)}
+    assert len(names) == 2
+    assert all(name.startswith("__asyncpg_") for name in names)
+    pool_options = {
+        "pool_size",
+        "max_overflow",
+        "pool_timeout",
+        "pool_pre_ping",
+        "pool_recycle",
+    }
+    assert not pool_options & engine_kwargs.keys()
+
+
+def test_queue_mode_sizes_the_pool_and_keeps_statement_caches(
+    engine_kwargs, monkeypatch
+):
+    monkeypatch.setattr(connection_to_db.settings, "db_pool_mode", "queue")
+    engine = connection_to_db.connect_to_postgresql()
+
+    assert isinstance(engine.pool, AsyncAdaptedQueuePool)
+    assert engine.pool.size() == connection_to_db.settings.db_pool_size
+    connect_args = engine_kwargs["connect_args"]
+    assert connect_args["statement_cache_size"] == 1024
+    assert connect_args["prepared_statement_cache_size"] == 1024
+    assert "prepared_statement_name_func" not in connect_args
+
+
+class _UnreachableEngine:
+    def __init__(self):
+        self.connect_calls = 0
+
+    def connect(self):
+        self.connect_calls += 1
+        raise OSError("connection refused")
+
+
+@pytest.fixture
+def unreachable_engine(monkeypatch):
+    engine = _UnreachableEngine()
+    monkeypatch.setattr(connection_to_db, "get_pg_engine", lambda: engine)
+    return engine
+
+
+def test_recent_healthy_check_is_reused(unreachable_engine, monkeypatch):
+    monkeypatch.setattr(connection_to_db, "_last_db_check_ok", time.monotonic())
+
+    assert asyncio.run(connection_to_db.check_db_connection()) is True
+    assert unreachable_engine.connect_calls == 0
+
+
+def test_failed_check_is_not_cached(unreachable_engine, monkeypatch):
+    monkeypatch.setattr(connection_to_db, "_last_db_check_ok", float("-inf"))
+
+    assert asyncio.run(connection_to_db.check_db_connection()) is False
+    assert asyncio.run(connection_to_db.check_db_connection()) is False
+    assert unreachable_engine.connect_calls == 2
@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+from sqlalchemy import Column, Integer, Table, text
+
+from helpers.database.connection_to_db import check_db_connection, get_pg_engine
+from helpers.database.init_db import init_db
+from helpers.database.models import Base
+
+TEST_SCHEMA = "pulseboard_test"
+
+
+@pytest.mark.parametrize("schema", [None, TEST_SCHEMA])
+def test_init_db_twice_finds_existing_tables(schema):
+    async def run():
+        if not await check_db_connection():
+            pytest.skip("PostgreSQL is not reachable with the configured DB_* settings")
+        engine = get_pg_engine()
+
+        async with engine.begin() as conn:
+            await conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {TEST_SCHEMA}"))
+        table = Table(
+            "init_db_items",
+            Base.metadata,
+            Column("id", Integer, primary_key=True),
+            schema=schema,
+        )
+        try:
+            await init_db()
+            # A second boot must find the table instead of creating it again
+            await init_db()
+        finally:
+            async with engine.begin() as conn:
+                await conn.run_sync(table.drop, checkfirst=True)
+                await conn.execute(text(f"DROP SCHEMA IF EXISTS {TEST_SCHEMA} CASCADE"))
+            Base.metadata.remove(table)
+            await engine.dispose()
+
+    asyncio.run(run())
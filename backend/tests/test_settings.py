@@ -0,0 +1,23 @@
+import pytest
+
+from helpers.settings import LoggingSettings, Settings
+
+
+@pytest.mark.parametrize(
+    "env_var, field",
+    [
+        ("MONGODB_PORT", "mongodb_port"),
+        ("WEAVIATE_PORT", "weaviate_port"),
+        ("WEAVIATE_GRPC_PORT", "weaviate_grpc_port"),
+        ("DB_PORT", "db_port"),
+    ],
+)
+def test_empty_port_is_unset(monkeypatch, env_var, field):
+    monkeypatch.setenv(env_var, "")
+    assert getattr(Settings(), field) is None
+
+
+def test_logging_settings_ignore_invalid_database_values(monkeypatch):
+    monkeypatch.setenv("DB_PORT", "not-a-port")
+    monkeypatch.setenv("BASE_LOG_DIR", "custom_logs")
+    assert LoggingSettings().base_log_dir == "custom_logs"